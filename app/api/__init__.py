@@ -16,6 +16,7 @@ from app.api.stremio import router as stremio_router
 from app.api.web import router as web_router
 from app.core.logging import logger
 from app.services.cache import CACHE_INSTANCE
+from app.services.tmdb import close_shared_client
 
 
 class CachedStaticFiles(StaticFiles):
@@ -44,6 +45,7 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Cache backend: in-memory LRU")
     yield
+    await close_shared_client()
 
 
 # Create FastAPI app
@@ -7,7 +7,6 @@ import time
 from functools import lru_cache, wraps
 from typing import Optional, List, Union, Awaitable, Any, Annotated
 
-import httpx
 from fastapi import APIRouter, HTTPException, Depends, Path
 from slugify import slugify
 
@@ -195,6 +194,61 @@ async def _cache_get_set(key: str, ttl: Optional[int], compute_coro: Awaitable[A
 
 # rpdb_response decorator moved to app.api.deps.rpdb_response
 
+# In-flight background catalog refreshes, keyed by cache key
+_CATALOG_REFRESHES: dict[str, asyncio.Task] = {}
+
+
+def _catalog_entry_ttl(entries: dict, catalog_ttl: int, stale_ttl: int) -> int:
+    """
+    Stamp a catalog cache entry with its freshness deadline and return the backend TTL.
+
+    The backend keeps the entry for the stale window on top of the remaining fresh time, so it
+    can still be served while a refresh runs. An existing deadline is kept when entries are extended.
+    """
+    now = time.time()
+    fresh_until = entries.setdefault("fresh_until", now + catalog_ttl)
+    return max(1, int(fresh_until - now)) + stale_ttl
+
+
+def _is_stale(entries: dict) -> bool:
+    """Check whether a cached catalog entry is past its freshness deadline."""
+    fresh_until = entries.get("fresh_until")
+    return fresh_until is not None and time.time() >= fresh_until
+
+
+def _schedule_catalog_refresh(
+    key: str,
+    cfg: Config,
+    prompt: str,
+    content_type: ContentType,
+    catalog_ttl: int,
+    stale_ttl: int,
+) -> None:
+    """Regenerate a stale catalog in the background, at most once per key at a time."""
+    if key in _CATALOG_REFRESHES:
+        return
+
+    async def refresh():
+        try:
+            result = await _process_catalog_request_internal(
+                cfg,
+                prompt,
+                content_type,
+                settings.MAX_CATALOG_RESULTS,
+                None,
+            )
+            if result.get("metas"):
+                entries = {"metas": result["metas"]}
+                await CACHE_INSTANCE.aset(key, entries, _catalog_entry_ttl(entries, catalog_ttl, stale_ttl))
+                logger.debug(f"Refreshed stale catalog for key={key} with {len(entries['metas'])} items")
+        except Exception as e:
+            logger.warning(f"Background catalog refresh failed for key={key}: {e}")
+
+    logger.debug(f"Serving stale catalog for key={key}, refreshing in background")
+    task = asyncio.create_task(refresh())
+    _CATALOG_REFRESHES[key] = task
+    task.add_done_callback(lambda _: _CATALOG_REFRESHES.pop(key, None))
+
 
 @router.get("/config/{config}/adult/{adult}/manifest.json")
 @router.get("/config/{config}/manifest.json")
@@ -279,82 +333,84 @@ async def _process_catalog_request_internal(
 
         llm_service = LLMService(config)
 
-        # Use shared HTTP client for all TMDB requests in this session
-        # Set a reasonable timeout for the client (e.g. 15s) to avoid hanging
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            tmdb_service = TMDBService(config.tmdb_read_access_token, language=config.language, client=client)
+        # TMDB requests go through the process-wide shared HTTP client
+        tmdb_service = TMDBService(config.tmdb_read_access_token, language=config.language, timeout=15.0)
 
-            user_intent = detect_user_intent(search)
+        user_intent = detect_user_intent(search)
 
-            if user_intent and user_intent != content_type:
-                logger.debug(
-                    f"User intent '{user_intent}' conflicts with endpoint type '{content_type}', returning empty list"
-                )
-                result = {"metas": []}
-                return result
-
-            result = None
-            if specific_title_query:
-                title, year = parse_title_with_year(search)
-                if title:
-                    logger.debug(
-                        f"Attempting direct TMDB lookup for '{title}'"
-                        + (f" ({year})" if year else "")
-                        + f" as {content_type.value}"
-                    )
-                    if content_type == ContentType.MOVIE:
-                        direct_results = await tmdb_service.search_movie(title, year)
-                        if direct_results:
-                            metas = []
-                            for res in direct_results:
-                                details = await tmdb_service.get_movie_details(res["id"])
-                                if details:
-                                    meta = movie_to_stremio_meta(details, poster_url=None)
-                                    metas.append(meta)
-
-                            if metas:
-                                result = {"metas": metas}
-                                logger.debug(f"Returning {len(metas)} direct TMDB matches for movie '{title}'")
-                    else:
-                        direct_results = await tmdb_service.search_tv(title, year)
-                        if direct_results:
-                            metas = []
-                            for res in direct_results:
-                                details = await tmdb_service.get_tv_details(res["id"])
-                                if details:
-                                    meta = tv_to_stremio_meta(details, poster_url=None)
-                                    metas.append(meta)
-
-                            if metas:
-                                result = {"metas": metas}
-                                logger.debug(f"Returning {len(metas)} direct TMDB matches for series '{title}'")
-
-            if result is None and content_type == ContentType.MOVIE:
-                movie_suggestions = await llm_service.generate_movie_suggestions(search, max_results)
-                logger.debug(
-                    f"Generated {len(movie_suggestions)} movie suggestions: {[f'{s.title} ({s.year})' for s in movie_suggestions]}"
-                )
-                movie_metas = await _process_metadata_pipeline(
-                    movie_suggestions,
-                    search_fn=tmdb_service.search_movie,
-                    details_fn=tmdb_service.get_movie_details,
-                    meta_builder=movie_to_stremio_meta,
-                )
-                logger.debug(f"Returning {len(movie_metas)} movie metadata entries")
-                result = {"metas": movie_metas}
-            elif result is None:
-                series_suggestions = await llm_service.generate_tv_suggestions(search, max_results)
+        if user_intent and user_intent != content_type:
+            logger.debug(
+                f"User intent '{user_intent}' conflicts with endpoint type '{content_type}', returning empty list"
+            )
+            result = {"metas": []}
+            return result
+
+        result = None
+        if specific_title_query:
+            title, year = parse_title_with_year(search)
+            if title:
                 logger.debug(
-                    f"Generated {len(series_suggestions)} TV series suggestions: {[f'{s.title} ({s.year})' for s in series_suggestions]}"
+                    f"Attempting direct TMDB lookup for '{title}'"
+                    + (f" ({year})" if year else "")
+                    + f" as {content_type.value}"
                 )
-                series_metas = await _process_metadata_pipeline(
-                    series_suggestions,
-                    search_fn=tmdb_service.search_tv,
-                    details_fn=tmdb_service.get_tv_details,
-                    meta_builder=tv_to_stremio_meta,
-                )
-                logger.debug(f"Returning {len(series_metas)} series metadata entries")
-                result = {"metas": series_metas}
+                if content_type == ContentType.MOVIE:
+                    direct_results = await tmdb_service.search_movie(title, year)
+                    if direct_results:
+                        metas = []
+                        details_list = await asyncio.gather(
+                            *(tmdb_service.get_movie_details(res["id"]) for res in direct_results)
+                        )
+                        for details in details_list:
+                            if details:
+                                meta = movie_to_stremio_meta(details, poster_url=None)
+                                metas.append(meta)
+
+                        if metas:
+                            result = {"metas": metas}
+                            logger.debug(f"Returning {len(metas)} direct TMDB matches for movie '{title}'")
+                else:
+                    direct_results = await tmdb_service.search_tv(title, year)
+                    if direct_results:
+                        metas = []
+                        details_list = await asyncio.gather(
+                            *(tmdb_service.get_tv_details(res["id"]) for res in direct_results)
+                        )
+                        for details in details_list:
+                            if details:
+                                meta = tv_to_stremio_meta(details, poster_url=None)
+                                metas.append(meta)
+
+                        if metas:
+                            result = {"metas": metas}
+                            logger.debug(f"Returning {len(metas)} direct TMDB matches for series '{title}'")
+
+        if result is None and content_type == ContentType.MOVIE:
+            movie_suggestions = await llm_service.generate_movie_suggestions(search, max_results)
+            logger.debug(
+                f"Generated {len(movie_suggestions)} movie suggestions: {[f'{s.title} ({s.year})' for s in movie_suggestions]}"
+            )
+            movie_metas = await _process_metadata_pipeline(
+                movie_suggestions,
+                search_fn=tmdb_service.search_movie,
+                details_fn=tmdb_service.get_movie_details,
+                meta_builder=movie_to_stremio_meta,
+            )
+            logger.debug(f"Returning {len(movie_metas)} movie metadata entries")
+            result = {"metas": movie_metas}
+        elif result is None:
+            series_suggestions = await llm_service.generate_tv_suggestions(search, max_results)
+            logger.debug(
+                f"Generated {len(series_suggestions)} TV series suggestions: {[f'{s.title} ({s.year})' for s in series_suggestions]}"
+            )
+            series_metas = await _process_metadata_pipeline(
+                series_suggestions,
+                search_fn=tmdb_service.search_tv,
+                details_fn=tmdb_service.get_tv_details,
+                meta_builder=tv_to_stremio_meta,
+            )
+            logger.debug(f"Returning {len(series_metas)} series metadata entries")
+            result = {"metas": series_metas}
 
         # Cache with TMDB posters only
         if cache_time_seconds and key:
@@ -400,6 +456,7 @@ async def _cached_catalog(
         catalog_ttl = catalog_ttl()  # Call function to get dynamic TTL
     elif catalog_ttl is None:
         catalog_ttl = cache.ttl  # Use default cache TTL
+    stale_ttl = catalog_config.get("stale_ttl", 0)
 
     # Use a simple, stable cache key for catalogs (tests expect this)
     key = "catalog:" + catalog_id
@@ -414,7 +471,9 @@ async def _cached_catalog(
             logger.debug(
                 f"LRU Cache: Returning {len(cached_entries.get('metas', []))} cached entries items for skip={skip}: {result_names}"
             )
-            return cached_entries
+            if _is_stale(cached_entries):
+                _schedule_catalog_refresh(key, cfg, prompt, content_type, catalog_ttl, stale_ttl)
+            return {"metas": cached_entries["metas"]}
         logger.debug(f"Cache miss for key={key}")
         result = await _process_catalog_request_internal(
             cfg,
@@ -423,7 +482,8 @@ async def _cached_catalog(
             settings.MAX_CATALOG_RESULTS,
             None,
         )
-        await cache.aset(key, result, catalog_ttl)
+        entries = {"metas": result["metas"]}
+        await cache.aset(key, entries, _catalog_entry_ttl(entries, catalog_ttl, stale_ttl))
         # Apply RPDB posters before delivery
         result_names = [meta.get("name", "Unknown") for meta in result.get("metas", [])]
         logger.debug(f"LRU Cache: Returning {len(result.get('metas', []))} items for skip={skip}: {result_names}")
@@ -434,6 +494,11 @@ async def _cached_catalog(
     # Check if we have enough entries to satisfy the request
     if cached_entries is not None and len(cached_entries["metas"]) > 0:
         logger.debug(f"Cache hit for key={key}, found {len(cached_entries['metas'])} existing entries")
+        if _is_stale(cached_entries):
+            # Serve stale entries as-is; only the background refresh writes the key, so a foreground
+            # extension cannot race it or start a second generation
+            _schedule_catalog_refresh(key, cfg, prompt, content_type, catalog_ttl, stale_ttl)
+            return {"metas": cached_entries["metas"]}
     else:
         cached_entries = {"metas": []}
         logger.debug(f"Cache miss for key={key}")
@@ -475,7 +540,7 @@ async def _cached_catalog(
 
     # Update cache with new entries (only possible with Redis)
     cached_entries["metas"].extend(new_metas)
-    await cache.aset(key, cached_entries, catalog_ttl)
+    await cache.aset(key, cached_entries, _catalog_entry_ttl(cached_entries, catalog_ttl, stale_ttl))
 
     logger.debug(f"Added {len(new_metas)} new entries, total now: {len(cached_entries['metas'])}")
 
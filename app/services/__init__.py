@@ -8,23 +8,26 @@ from .rpdb import RPDBService
 from .encryption import encryption_service
 
 import datetime
+import time
+
+
+def _next_tuesday_epoch(now: float) -> int:
+    """Get the next Tuesday at midnight UTC as epoch seconds, using integer day arithmetic."""
+    days_since_epoch = int(now) // 86400
+    weekday = (days_since_epoch + 3) % 7  # 1970-01-01 was a Thursday (Monday is 0)
+    days_ahead = (1 - weekday) % 7 or 7  # Tuesday is 1; today counts as already happened
+    return (days_since_epoch + days_ahead) * 86400
 
 
 def get_next_tuesday():
     """Get the next Tuesday at midnight UTC."""
-    today = datetime.datetime.now(datetime.timezone.utc)
-    days_ahead = 1 - today.weekday()  # Tuesday is 1 (Monday is 0)
-    if days_ahead <= 0:  # Target day already happened this week
-        days_ahead += 7
-    next_tuesday = today + datetime.timedelta(days=days_ahead)
-    return next_tuesday.replace(hour=0, minute=0, second=0, microsecond=0)
+    return datetime.datetime.fromtimestamp(_next_tuesday_epoch(time.time()), datetime.timezone.utc)
 
 
 def get_tuesday_to_tuesday_ttl():
     """Get TTL in seconds from now until next Tuesday."""
-    next_tuesday = get_next_tuesday()
-    now = datetime.datetime.now(datetime.timezone.utc)
-    return int((next_tuesday - now).total_seconds())
+    now = time.time()
+    return int(_next_tuesday_epoch(now) - now)
 
 
 CATALOG_PROMPTS = {
@@ -32,21 +35,25 @@ CATALOG_PROMPTS = {
         "title": "Trending this week",
         "prompt": "Show me what's trending this week on streaming services and (P)VOD (or Blu-ray releases if relevant).",
         "cache_ttl": get_tuesday_to_tuesday_ttl,  # Dynamic TTL until next Tuesday
+        "stale_ttl": 21600,  # Serve stale for 6 hours while refreshing
     },
     "new_releases": {
         "title": "Recent Releases",
         "prompt": "Show me highly-rated new releases from the past 6 months that have received positive reception.",
         "cache_ttl": 172800,  # 48 hours
+        "stale_ttl": 21600,  # 6 hours
     },
     "critics_picks": {
         "title": "Critics' Picks",
         "prompt": "Show me highly-rated titles from critics, award winners, and critically acclaimed works from any era.",
         "cache_ttl": 604800,  # 7 days
+        "stale_ttl": 86400,  # 24 hours
     },
     "hidden_gems": {
         "title": "Hidden Gems",
         "prompt": "Show me underrated, lesser-known, or overlooked titles worth watching that deserve more recognition.",
         "cache_ttl": 1209600,  # 14 days
+        "stale_ttl": 86400,  # 24 hours
     },
 }
 
@@ -1,10 +1,11 @@
-import json
 import logging
 import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from typing import Any, Optional
 
+import orjson
+
 from app.core.config import settings
 
 try:
@@ -69,14 +70,14 @@ class RedisBackend(CacheBackend):
             value = await self._redis.get(key)
             if value is None:
                 return None
-            return json.loads(value)
-        except (RedisError, json.JSONDecodeError) as e:
+            return orjson.loads(value)
+        except (RedisError, orjson.JSONDecodeError) as e:
             logger.warning(f"Redis get error for key '{key}': {e}")
             return None
 
     async def set(self, key: str, value: Any, ttl: int) -> None:
         try:
-            serialized = json.dumps(value, default=str)
+            serialized = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
             await self._redis.setex(key, ttl, serialized)
         except (RedisError, TypeError, ValueError) as e:
             logger.warning(f"Redis set error for key '{key}': {e}")
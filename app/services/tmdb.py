@@ -2,74 +2,117 @@
 TMDB service for the Stremio AI Companion application.
 """
 
-import difflib
+import asyncio
+import heapq
 import logging
+import operator
+from functools import wraps
 from typing import Any, Optional, List
 
 import httpx
-from pydantic import BaseModel, ConfigDict
+import orjson
+from rapidfuzz import process, utils
+from rapidfuzz.distance import Jaro
 
+from app.services.cache import MemoryBackend
 
-class TMDBSearchParams(BaseModel):
-    """Parameters for TMDB search requests."""
+# Jaro similarity thresholds for TMDB search results. The Winkler prefix bonus is left off
+# because it lifts prefix and sequel titles ("Lost" -> "Lost in Translation") into the
+# relaxed band; calibrated against the title pairs in tests/unit/services/test_tmdb.py
+RELAXED_MATCH_THRESHOLD = 0.85
+TOP_RESULT_THRESHOLD = 0.70
 
-    model_config = ConfigDict(frozen=True)
+# Process-wide HTTP client so TMDB connections are kept alive and multiplexed across requests
+_SHARED_CLIENT: Optional[httpx.AsyncClient] = None
 
-    query: str
-    language: str
-    page: int = 1
-    year: Optional[int] = None
 
+def _get_shared_client() -> httpx.AsyncClient:
+    """
+    Get the shared TMDB HTTP client, creating it on first use.
 
-class TMDBMovieSearchParams(TMDBSearchParams):
-    """Parameters specific to movie search requests."""
-
-    @property
-    def api_params(self) -> dict[str, str]:
-        """Convert to API parameters dictionary."""
-        params = {
-            "query": self.query,
-            "include_adult": "false",
-            "language": self.language,
-            "page": str(self.page),
-        }
-        if self.year:
-            params["primary_release_year"] = str(self.year)
-        return params
-
-
-class TMDBTVSearchParams(TMDBSearchParams):
-    """Parameters specific to TV search requests."""
-
-    @property
-    def api_params(self) -> dict[str, str]:
-        """Convert to API parameters dictionary."""
-        params = {
-            "query": self.query,
-            "include_adult": "false",
-            "language": self.language,
-            "page": str(self.page),
-        }
-        if self.year:
-            params["first_air_date_year"] = str(self.year)
-        return params
-
-
-class TMDBDetailsParams(BaseModel):
-    """Parameters for TMDB details requests."""
-
-    model_config = ConfigDict(frozen=True)
+    Returns:
+        The process-wide httpx.AsyncClient
+    """
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed:
+        _SHARED_CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            headers={"accept": "application/json"},
+        )
+    return _SHARED_CLIENT
+
+
+async def close_shared_client() -> None:
+    """Close the shared TMDB HTTP client if it was created."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is not None:
+        await _SHARED_CLIENT.aclose()
+        _SHARED_CLIENT = None
+
+
+class _MemoCache:
+    """
+    In-process memoization for TMDB lookups with single-flight coalescing.
 
-    language: str
-    append_to_response: str = "external_ids"
+    Results are stored in a MemoryBackend (TTL + LRU). Concurrent calls for the same
+    key share one in-flight request instead of each issuing their own HTTP call.
+    """
 
-    @property
-    def api_params(self) -> dict[str, str]:
-        """Convert to API parameters dictionary."""
-        return {
-            "language": self.language,
-            "append_to_response": self.append_to_response,
-        }
+    def __init__(self, ttl_seconds: int = 86400, maxsize: int = 4096):
+        self._backend = MemoryBackend(maxsize=maxsize)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._ttl = ttl_seconds
+
+    async def clear(self) -> None:
+        await self._backend.clear()
+
+    def memoize(self, func):
+        """Decorate a TMDBService coroutine method; keys include the service language and call arguments."""
+
+        @wraps(func)
+        async def wrapper(service: "TMDBService", *args, **kwargs):
+            key = f"{func.__name__}:{service.language}:{args!r}:{sorted(kwargs.items())!r}"
+
+            cached = await self._backend.get(key)
+            if cached is not None:
+                return cached
+
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                try:
+                    return await asyncio.shield(inflight)
+                except asyncio.CancelledError:
+                    if not inflight.cancelled():
+                        raise
+                    # The request we joined was cancelled by its owner, issue our own
+                    return await wrapper(service, *args, **kwargs)
+
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            try:
+                result = await func(service, *args, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception()  # Mark as retrieved when there are no waiters
+                raise
+            finally:
+                self._inflight.pop(key, None)
+
+            # Only successful lookups are cached so transient failures are retried
+            if result:
+                await self._backend.set(key, result, self._ttl)
+            future.set_result(result)
+            return result
+
+        return wrapper
+
+
+_MEMO = _MemoCache()
 
 
 class TMDBService:
@@ -94,7 +137,7 @@ class TMDBService:
             read_access_token: TMDB API read access token
             language: Language code for API requests
             timeout: HTTP request timeout in seconds
-            client: Optional shared httpx.AsyncClient
+            client: Optional httpx.AsyncClient, defaults to the process-wide shared client
         """
         self.read_access_token = read_access_token
         self.base_url = "https://api.themoviedb.org/3"
@@ -102,6 +145,7 @@ class TMDBService:
         self.logger = logging.getLogger("stremio_ai_companion.TMDBService")
         self.language = language
         self.client = client
+        self._base_search_params = {"include_adult": "false", "page": "1", "language": language}
 
     @property
     def _headers(self) -> dict[str, str]:
@@ -124,25 +168,23 @@ class TMDBService:
         Returns:
             Response data or None if request failed
         """
-        if self.client:
-            return await self._execute_request(self.client, endpoint, params)
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            return await self._execute_request(client, endpoint, params)
+        return await self._execute_request(self.client or _get_shared_client(), endpoint, params)
 
     async def _execute_request(
         self, client: httpx.AsyncClient, endpoint: str, params: dict[str, str]
     ) -> Optional[dict[str, Any]]:
         """Execute the request with the given client."""
         try:
-            response = await client.get(f"{self.base_url}/{endpoint}", params=params, headers=self._headers)
+            response = await client.get(
+                f"{self.base_url}/{endpoint}", params=params, headers=self._headers, timeout=self.timeout
+            )
             response.raise_for_status()
 
             if response.status_code == 401:
                 self.logger.error("TMDB API authentication failed - check read access token")
                 return None
 
-            return response.json()
+            return orjson.loads(response.content)
 
         except httpx.TimeoutException:
             self.logger.warning(f"TMDB request timeout for endpoint: {endpoint}")
@@ -154,6 +196,7 @@ class TMDBService:
             self.logger.error(f"TMDB request error for {endpoint}: {e}")
             return None
 
+    @_MEMO.memoize
     async def search_movie(
         self,
         title: str,
@@ -171,57 +214,51 @@ class TMDBService:
         """
         self.logger.debug(f"Searching TMDB for movie: '{title}'" + (f" ({year})" if year else ""))
 
-        search_params = TMDBMovieSearchParams(query=title, year=year, language=self.language)
+        params = {**self._base_search_params, "query": title}
+        if year:
+            params["primary_release_year"] = str(year)
 
-        data = await self._make_request("search/movie", search_params.api_params)
+        data = await self._make_request("search/movie", params)
 
         if not data or not data.get("results"):
             self.logger.warning(f"No TMDB results found for movie '{title}'" + (f" ({year})" if year else ""))
             return []
 
-        # Thresholds
-        FUZZY_MATCH_THRESHOLD = 0.85
-        RELAXED_MATCH_THRESHOLD = 0.65
-        TOP_RESULT_THRESHOLD = 0.40
-
-        matches = []
+        best: dict[int, tuple[float, dict[str, Any]]] = {}
         tmdb_results = data["results"]
+        title_lower = title.lower()
+
+        # Score results in TMDB order with the query preprocessed once; anything below the top
+        # result threshold is skipped inside rapidfuzz, and the final ranking happens below
+        scored = process.extract_iter(
+            title,
+            [res.get("title", "") for res in tmdb_results],
+            scorer=Jaro.normalized_similarity,
+            processor=utils.default_process,
+            score_cutoff=TOP_RESULT_THRESHOLD,
+        )
 
-        for index, res in enumerate(tmdb_results):
-            res_title = res.get("title", "")
+        for res_title, score, index in scored:
+            res = tmdb_results[index]
 
             # Exact match
-            if res_title.lower() == title.lower():
-                res["_score"] = 1.0
-                matches.append(res)
+            if res_title.lower() == title_lower:
+                score = 1.0
+                # An exact title and year match on the top result is final, skip scoring the rest
+                if index == 0 and year and (res.get("release_date") or "").startswith(str(year)):
+                    self.logger.debug(f"Exact TMDB match for movie '{title}' ({year})")
+                    return [res]
+            # Keep if relaxed score, or the top result if it has a decent score
+            elif score < RELAXED_MATCH_THRESHOLD and not (index == 0 and score >= TOP_RESULT_THRESHOLD):
                 continue
 
-            score = difflib.SequenceMatcher(None, title.lower(), res_title.lower()).ratio()
-            res["_score"] = score
-
-            # Keep if high enough score
-            if score >= FUZZY_MATCH_THRESHOLD:
-                matches.append(res)
-            # Keep if relaxed score
-            elif score >= RELAXED_MATCH_THRESHOLD:
-                matches.append(res)
-            # Keep top result if it has a decent score
-            elif index == 0 and score >= TOP_RESULT_THRESHOLD:
-                matches.append(res)
-
-        # Deduplicate by ID
-        unique_matches = []
-        seen_ids = set()
-        for m in matches:
-            if m["id"] not in seen_ids:
-                unique_matches.append(m)
-                seen_ids.add(m["id"])
-
-        # Sort by score descending
-        unique_matches.sort(key=lambda x: x.get("_score", 0), reverse=True)
-
-        if unique_matches:
-            top_matches = unique_matches[:5]
+            # Deduplicate by ID, keeping the best score
+            prev = best.get(res["id"])
+            if prev is None or prev[0] < score:
+                best[res["id"]] = (score, res)
+
+        if best:
+            top_matches = [res for _, res in heapq.nlargest(5, best.values(), key=operator.itemgetter(0))]
             self.logger.debug(
                 f"Found {len(top_matches)} TMDB results for '{title}': {[m.get('title') for m in top_matches]}"
             )
@@ -230,6 +267,7 @@ class TMDBService:
         self.logger.info(f"No close match found for movie '{title}'. Triggering AI fallback.")
         return []
 
+    @_MEMO.memoize
     async def search_tv(
         self,
         title: str,
@@ -247,57 +285,51 @@ class TMDBService:
         """
         self.logger.debug(f"Searching TMDB for TV series: '{title}'" + (f" ({year})" if year else ""))
 
-        search_params = TMDBTVSearchParams(query=title, year=year, language=self.language)
+        params = {**self._base_search_params, "query": title}
+        if year:
+            params["first_air_date_year"] = str(year)
 
-        data = await self._make_request("search/tv", search_params.api_params)
+        data = await self._make_request("search/tv", params)
 
         if not data or not data.get("results"):
             self.logger.warning(f"No TMDB results found for series '{title}'" + (f" ({year})" if year else ""))
             return []
 
-        # Thresholds
-        FUZZY_MATCH_THRESHOLD = 0.85
-        RELAXED_MATCH_THRESHOLD = 0.65
-        TOP_RESULT_THRESHOLD = 0.40
-
-        matches = []
+        best: dict[int, tuple[float, dict[str, Any]]] = {}
         tmdb_results = data["results"]
+        title_lower = title.lower()
+
+        # Score results in TMDB order with the query preprocessed once; anything below the top
+        # result threshold is skipped inside rapidfuzz, and the final ranking happens below
+        scored = process.extract_iter(
+            title,
+            [res.get("name", "") for res in tmdb_results],
+            scorer=Jaro.normalized_similarity,
+            processor=utils.default_process,
+            score_cutoff=TOP_RESULT_THRESHOLD,
+        )
 
-        for index, res in enumerate(tmdb_results):
-            res_name = res.get("name", "")
+        for res_name, score, index in scored:
+            res = tmdb_results[index]
 
             # Exact match
-            if res_name.lower() == title.lower():
-                res["_score"] = 1.0
-                matches.append(res)
+            if res_name.lower() == title_lower:
+                score = 1.0
+                # An exact title and year match on the top result is final, skip scoring the rest
+                if index == 0 and year and (res.get("first_air_date") or "").startswith(str(year)):
+                    self.logger.debug(f"Exact TMDB match for series '{title}' ({year})")
+                    return [res]
+            # Keep if relaxed score, or the top result if it has a decent score
+            elif score < RELAXED_MATCH_THRESHOLD and not (index == 0 and score >= TOP_RESULT_THRESHOLD):
                 continue
 
-            score = difflib.SequenceMatcher(None, title.lower(), res_name.lower()).ratio()
-            res["_score"] = score
-
-            # Keep if high enough score
-            if score >= FUZZY_MATCH_THRESHOLD:
-                matches.append(res)
-            # Keep if relaxed score
-            elif score >= RELAXED_MATCH_THRESHOLD:
-                matches.append(res)
-            # Keep top result if it has a decent score
-            elif index == 0 and score >= TOP_RESULT_THRESHOLD:
-                matches.append(res)
-
-        # Deduplicate by ID
-        unique_matches = []
-        seen_ids = set()
-        for m in matches:
-            if m["id"] not in seen_ids:
-                unique_matches.append(m)
-                seen_ids.add(m["id"])
-
-        # Sort by score descending
-        unique_matches.sort(key=lambda x: x.get("_score", 0), reverse=True)
-
-        if unique_matches:
-            top_matches = unique_matches[:5]
+            # Deduplicate by ID, keeping the best score
+            prev = best.get(res["id"])
+            if prev is None or prev[0] < score:
+                best[res["id"]] = (score, res)
+
+        if best:
+            top_matches = [res for _, res in heapq.nlargest(5, best.values(), key=operator.itemgetter(0))]
             self.logger.debug(
                 f"Found {len(top_matches)} TMDB results for '{title}': {[m.get('name') for m in top_matches]}"
             )
@@ -306,40 +338,50 @@ class TMDBService:
         self.logger.info(f"No close match found for series '{title}'. Triggering AI fallback.")
         return []
 
-    async def get_movie_details(self, movie_id: int) -> Optional[dict[str, Any]]:
+    @_MEMO.memoize
+    async def get_movie_details(
+        self, movie_id: int, *, append: tuple[str, ...] = ("external_ids",)
+    ) -> Optional[dict[str, Any]]:
         """
         Get detailed information about a movie by ID.
 
         Args:
             movie_id: TMDB movie ID
+            append: Sub-resources to fold into the same request via append_to_response
+                (e.g. "external_ids", "credits", "videos", "images"; TMDB allows up to 20)
 
         Returns:
             Dictionary with movie details or None if not found
         """
         self.logger.debug(f"Fetching TMDB details for movie ID: {movie_id}")
 
-        details_params = TMDBDetailsParams(language=self.language)
-        data = await self._make_request(f"movie/{movie_id}", details_params.api_params)
+        params = {"language": self.language, "append_to_response": ",".join(append)}
+        data = await self._make_request(f"movie/{movie_id}", params)
 
         if data:
             self.logger.debug(f"Successfully fetched details for movie ID {movie_id}: {data.get('title', 'Unknown')}")
 
         return data
 
-    async def get_tv_details(self, tv_id: int) -> Optional[dict[str, Any]]:
+    @_MEMO.memoize
+    async def get_tv_details(
+        self, tv_id: int, *, append: tuple[str, ...] = ("external_ids",)
+    ) -> Optional[dict[str, Any]]:
         """
         Get detailed information about a TV series by ID.
 
         Args:
             tv_id: TMDB TV series ID
+            append: Sub-resources to fold into the same request via append_to_response
+                (e.g. "external_ids", "credits", "videos", "images"; TMDB allows up to 20)
 
         Returns:
             Dictionary with TV series details or None if not found
         """
         self.logger.debug(f"Fetching TMDB details for TV series ID: {tv_id}")
 
-        details_params = TMDBDetailsParams(language=self.language)
-        data = await self._make_request(f"tv/{tv_id}", details_params.api_params)
+        params = {"language": self.language, "append_to_response": ",".join(append)}
+        data = await self._make_request(f"tv/{tv_id}", params)
 
         if data:
             self.logger.debug(f"Successfully fetched details for TV series ID {tv_id}: {data.get('name', 'Unknown')}")
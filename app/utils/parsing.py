@@ -3,11 +3,58 @@ Parsing utilities for the Stremio AI Companion application.
 """
 
 import re
+from functools import lru_cache
 from typing import Tuple, Optional
 
 from app.models.enums import ContentType
 
-
+# Year in parentheses at the end of a title, e.g. "The Matrix (1999)"
+_YEAR_TAIL = re.compile(r"\s*\((\d{4})\)\s*$")
+# Bare trailing year, e.g. "The Matrix 1999"
+_TRAILING_YEAR = re.compile(r"\s+(?P<year>(?:19|20)\d{2})\s*$")
+
+# Quoted titles or a year in parentheses mark a specific title lookup
+_QUOTE_OR_PAREN_YEAR = re.compile(r"[\"“”‘’]|\((?:19|20)\d{2}\)")
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+
+# Patterns indicating a discovery query rather than a specific title lookup
+_DISCOVERY = re.compile(
+    "|".join(
+        [
+            r"\btop\b",
+            r"\bbest\b",
+            r"\bpopular\b",
+            r"\btrending\b",
+            r"\brecommend(?:ation|ations|ed|ing)?\b",
+            r"\bsuggest(?:ion|ions|ed|ing)?\b",
+            r"\blist\b",
+            r"\branked\b",
+            r"\bcollection\b",
+            r"\btheme\b",
+            r"\b(?:movies?|films?|shows?|series|tv)\b",
+            r"\b(?:similar to|like)\b",
+            r"\b2000s|1990s|1980s|1970s|1960s|1950s\b",
+        ]
+    )
+)
+
+# Content type keywords as named groups so one scan tallies every intent signal
+_INTENT = re.compile(
+    # Movie-specific keywords: "movie", "film", "cinema", "flick", "motion picture", "feature film", "blockbuster"
+    r"(?P<movie>\b(?:movies?|films?|cinema|flicks?|motion pictures?|feature films?|blockbusters?)\b)"
+    # TV/Series-specific keywords: "tv show", "television series", "sitcom", "episode", "drama series", ...
+    r"|(?P<series>\b(?:tv\s+shows?|television(?:\s+(?:shows?|series))?|series|sitcoms?|miniseries"
+    r"|documentary\s+series|episodes?|seasons?|dramas?\s+series)\b)"
+    # A bare "show" only counts as series intent outside movie / "show me" contexts
+    r"|(?P<show>\bshows?\b)"
+    # Mixed content indicators
+    r"|(?P<mix>\b(?:and|or)\b)"
+)
+_MOVIE_SHOW = re.compile(r"\b(?:movie|film|cinema)\s+shows?\b")
+_SHOW_ME = re.compile(r"\bshow\s+me\b")
+
+
+@lru_cache(maxsize=8192)
 def parse_movie_with_year(movie_title: str) -> Tuple[str, Optional[int]]:
     """
     Parse a movie title from LLM response to extract title and year.
@@ -23,18 +70,15 @@ def parse_movie_with_year(movie_title: str) -> Tuple[str, Optional[int]]:
         - "Inception (2010)" -> ("Inception", 2010)
         - "Some Movie" -> ("Some Movie", None)
     """
-    # Pattern to match year in parentheses
-    year_pattern = r"\s*\((\d{4})\)\s*$"
-    match = re.search(year_pattern, movie_title)
+    match = _YEAR_TAIL.search(movie_title)
 
     if match:
-        year = int(match.group(1))
-        title = re.sub(year_pattern, "", movie_title).strip()
-        return title, year
+        return movie_title[: match.start()].strip(), int(match.group(1))
 
     return movie_title.strip(), None
 
 
+@lru_cache(maxsize=8192)
 def parse_title_with_year(search: str) -> Tuple[str, Optional[int]]:
     """
     Parse a search query to extract a trailing year when present.
@@ -49,16 +93,14 @@ def parse_title_with_year(search: str) -> Tuple[str, Optional[int]]:
     if year:
         return title, year
 
-    trailing_year_pattern = r"\s+(?P<year>(19|20)\d{2})\s*$"
-    match = re.search(trailing_year_pattern, search)
+    match = _TRAILING_YEAR.search(search)
     if match:
-        year = int(match.group("year"))
-        title = re.sub(trailing_year_pattern, "", search).strip()
-        return title, year
+        return search[: match.start()].strip(), int(match.group("year"))
 
     return search.strip(), None
 
 
+@lru_cache(maxsize=8192)
 def is_specific_title_query(search: str) -> bool:
     """
     Determine if a search query looks like a specific title lookup.
@@ -72,40 +114,22 @@ def is_specific_title_query(search: str) -> bool:
     if not search:
         return False
 
-    search_lower = search.lower().strip()
-
-    if re.search(r"[\"“”‘’]", search):
+    if _QUOTE_OR_PAREN_YEAR.search(search):
         return True
 
-    if re.search(r"\((19|20)\d{2}\)", search):
-        return True
+    search_lower = search.lower().strip()
 
-    discovery_patterns = [
-        r"\btop\b",
-        r"\bbest\b",
-        r"\bpopular\b",
-        r"\btrending\b",
-        r"\brecommend(?:ation|ations|ed|ing)?\b",
-        r"\bsuggest(?:ion|ions|ed|ing)?\b",
-        r"\blist\b",
-        r"\branked\b",
-        r"\bcollection\b",
-        r"\btheme\b",
-        r"\b(movies?|films?|shows?|series|tv)\b",
-        r"\b(similar to|like)\b",
-        r"\b2000s|1990s|1980s|1970s|1960s|1950s\b",
-    ]
-
-    if any(re.search(pattern, search_lower) for pattern in discovery_patterns):
+    if _DISCOVERY.search(search_lower):
         return False
 
-    if re.search(r"\b(19|20)\d{2}\b", search_lower):
+    if _YEAR.search(search_lower):
         return True
 
-    word_count = len(search_lower.split())
-    return word_count <= 6
+    # Bounded split: more than six words is all we need to know
+    return len(search_lower.split(None, 6)) <= 6
 
 
+@lru_cache(maxsize=8192)
 def detect_user_intent(search: str) -> Optional[str]:
     """
     Detect user intent from search query using regex patterns.
@@ -121,56 +145,21 @@ def detect_user_intent(search: str) -> Optional[str]:
     if not search:
         return None
 
-    search_lower = search.lower()
-
-    # Movie-specific patterns (more comprehensive)
-    movie_patterns = [
-        r"\bmovies?\b",  # "movie", "movies"
-        r"\bfilms?\b",  # "film", "films"
-        r"\bcinema\b",  # "cinema"
-        r"\bflicks?\b",  # "flick", "flicks"
-        r"\bmotion pictures?\b",  # "motion picture"
-        r"\bfeature films?\b",  # "feature film"
-        r"\bblockbusters?\b",  # "blockbuster"
-    ]
-
-    # TV/Series-specific patterns (more comprehensive)
-    series_patterns = [
-        r"\btv\s+shows?\b",  # "tv show", "tv shows"
-        r"\btelevision\s+shows?\b",  # "television show"
-        r"\btelevision\b",  # "television"
-        r"\bseries\b",  # "series"
-        r"\bshows?\b",  # "show", "shows" (when not preceded by movie-related words)
-        r"\btv\s+series\b",  # "tv series"
-        r"\btelevision\s+series\b",  # "television series"
-        r"\bepisodes?\b",  # "episode", "episodes"
-        r"\bseasons?\b",  # "season", "seasons"
-        r"\bsitcoms?\b",  # "sitcom", "sitcoms"
-        r"\bdramas?\s+series\b",  # "drama series"
-        r"\bminiseries\b",  # "miniseries"
-        r"\bdocumentary\s+series\b",  # "documentary series"
-    ]
-
-    # Check for movie patterns
-    movie_matches = sum(1 for pattern in movie_patterns if re.search(pattern, search_lower))
-
-    # Check for series patterns, but exclude "shows" if it's preceded by movie-related words
-    series_matches = 0
-    for pattern in series_patterns:
-        if pattern == r"\bshows?\b":
-            # Special handling for "shows" - exclude if preceded by movie words or in non-TV context
-            if (
-                re.search(r"\bshows?\b", search_lower)
-                and not re.search(r"\b(?:movie|film|cinema)\s+shows?\b", search_lower)
-                and not re.search(r"\bshow\s+me\b", search_lower)
-            ):
-                series_matches += 1
-        else:
-            if re.search(pattern, search_lower):
-                series_matches += 1
+    search_lower = search.casefold()
+
+    hits = {"movie": 0, "series": 0, "show": 0, "mix": 0}
+    for match in _INTENT.finditer(search_lower):
+        hits[match.lastgroup] += 1
+
+    movie_matches = hits["movie"]
+    series_matches = hits["series"]
+
+    # Special handling for "shows" - exclude if preceded by movie words or in non-TV context
+    if hits["show"] and not _MOVIE_SHOW.search(search_lower) and not _SHOW_ME.search(search_lower):
+        series_matches += 1
 
     # Check for mixed content indicators
-    has_mixed_content = re.search(r"\b(?:and|or)\b", search_lower) and movie_matches > 0 and series_matches > 0
+    has_mixed_content = hits["mix"] > 0 and movie_matches > 0 and series_matches > 0
 
     # Determine intent based on matches
     if has_mixed_content:
@@ -2,11 +2,12 @@
 Tests for the _cached_catalog function in the Stremio API.
 """
 
+import time
 from unittest.mock import patch, AsyncMock
 
 import pytest
 
-from app.api.stremio import _cached_catalog
+from app.api.stremio import _CATALOG_REFRESHES, _cached_catalog
 from app.models.enums import ContentType
 
 
@@ -56,7 +57,8 @@ class TestCachedCatalog:
         # Verify cache set
         mock_cache.aset.assert_called_once()
         assert mock_cache.aset.call_args[0][0] == cache_key_arg
-        assert mock_cache.aset.call_args[0][1] == result
+        assert mock_cache.aset.call_args[0][1]["metas"] == result["metas"]
+        assert "fresh_until" in mock_cache.aset.call_args[0][1]
 
     @pytest.mark.asyncio
     async def test_lru_cache_hit(self, mock_cache, mock_process_catalog_request):
@@ -79,6 +81,37 @@ class TestCachedCatalog:
         # Verify no cache set
         mock_cache.aset.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_lru_cache_stale_hit_refreshes_in_background(self, mock_cache, mock_process_catalog_request):
+        """Test that a stale entry is served immediately and refreshed in the background."""
+        cached_data = {"metas": [{"name": "Cached Movie", "id": "cached-id"}], "fresh_until": time.time() - 1}
+        mock_cache.aget.return_value = cached_data
+
+        result = await _cached_catalog("test_config", ContentType.MOVIE, "trending_movie")
+
+        # Stale data is returned without waiting for the refresh
+        assert result == {"metas": [{"name": "Cached Movie", "id": "cached-id"}]}
+        mock_cache.aset.assert_not_called()
+
+        await _CATALOG_REFRESHES["catalog:trending_movie"]
+
+        mock_process_catalog_request.assert_called_once()
+        mock_cache.aset.assert_called_once()
+        assert mock_cache.aset.call_args[0][1]["metas"] == [{"name": "Test Movie", "id": "test-id"}]
+        assert mock_cache.aset.call_args[0][1]["fresh_until"] > time.time()
+
+    @pytest.mark.asyncio
+    async def test_lru_cache_fresh_hit_no_refresh(self, mock_cache, mock_process_catalog_request):
+        """Test that a fresh entry does not trigger a refresh."""
+        cached_data = {"metas": [{"name": "Cached Movie", "id": "cached-id"}], "fresh_until": time.time() + 60}
+        mock_cache.aget.return_value = cached_data
+
+        result = await _cached_catalog("test_config", ContentType.MOVIE, "trending_movie")
+
+        assert result == {"metas": [{"name": "Cached Movie", "id": "cached-id"}]}
+        assert "catalog:trending_movie" not in _CATALOG_REFRESHES
+        mock_process_catalog_request.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_redis_cache_skip_zero(self, mock_cache, mock_process_catalog_request):
         """Test Redis cache behavior with skip=0."""
@@ -101,6 +134,31 @@ class TestCachedCatalog:
         # Verify cache set
         mock_cache.aset.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_redis_cache_stale_hit_refreshes_in_background(self, mock_cache, mock_process_catalog_request):
+        """Test that a stale Redis entry is served as-is and only the background refresh writes the key."""
+        mock_cache.is_redis = True
+        stale_entries = {
+            "metas": [{"name": "Stale Movie 1", "id": "stale-1"}, {"name": "Stale Movie 2", "id": "stale-2"}],
+            "fresh_until": time.time() - 1,
+        }
+        mock_cache.aget.return_value = stale_entries
+
+        result = await _cached_catalog("test_config", ContentType.MOVIE, "trending_movie", skip=100)
+
+        # Stale entries are returned without extending them in the foreground
+        assert result == {"metas": stale_entries["metas"]}
+        mock_cache.aset.assert_not_called()
+
+        await _CATALOG_REFRESHES["catalog:trending_movie"]
+
+        # Exactly one generation ran, and its fresh result replaced the stale entry
+        mock_process_catalog_request.assert_called_once()
+        assert "Avoid recommending" not in mock_process_catalog_request.call_args[0][1]
+        mock_cache.aset.assert_called_once()
+        assert mock_cache.aset.call_args[0][1]["metas"] == [{"name": "Test Movie", "id": "test-id"}]
+        assert mock_cache.aset.call_args[0][1]["fresh_until"] > time.time()
+
     @pytest.mark.asyncio
     async def test_redis_cache_with_existing_entries(self, mock_cache, mock_process_catalog_request):
         """Test Redis cache with existing entries."""
@@ -235,7 +293,7 @@ class TestCachedCatalog:
                 "metas": [{"name": "Existing Movie", "id": "existing-id"}, {"name": "New Movie", "id": "new-id"}]
             }
             mock_cache.aset.assert_called_once()
-            assert mock_cache.aset.call_args[0][1] == expected_combined
+            assert mock_cache.aset.call_args[0][1]["metas"] == expected_combined["metas"]
 
             # Verify result contains all entries (existing + new non-duplicate)
             assert result == {
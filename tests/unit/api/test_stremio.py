@@ -2,11 +2,16 @@
 Tests for the Stremio API endpoints.
 """
 
+import asyncio
+from unittest.mock import patch, AsyncMock
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.api import app
 from app.api.deps import get_config
+from app.api.stremio import _process_catalog_request_internal
+from app.models.enums import ContentType
 from app.models.config import Config
 from app.core.config import settings
 
@@ -130,3 +135,33 @@ class TestStremioRouter:
         assert response.status_code == 200
         data = response.json()
         assert "metas" in data
+
+
+class TestDirectTitleLookup:
+    """Tests for the direct TMDB lookup path of catalog requests."""
+
+    async def test_details_fetched_concurrently(self, sample_config, sample_tmdb_movie):
+        """Test that details for all direct matches are fetched concurrently and kept in order."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_movie_details(movie_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {**sample_tmdb_movie, "id": movie_id, "title": f"Movie {movie_id}"}
+
+        with (
+            patch("app.api.stremio.LLMService"),
+            patch("app.api.stremio.TMDBService") as mock_tmdb_cls,
+        ):
+            tmdb = mock_tmdb_cls.return_value
+            tmdb.search_movie = AsyncMock(return_value=[{"id": 1}, {"id": 2}, {"id": 3}])
+            tmdb.get_movie_details = get_movie_details
+
+            result = await _process_catalog_request_internal(sample_config, "Fight Club", ContentType.MOVIE)
+
+        assert [meta["name"] for meta in result["metas"]] == ["Movie 1", "Movie 2", "Movie 3"]
+        assert max_in_flight == 3
@@ -2,18 +2,27 @@
 Tests for the TMDB service.
 """
 
+import asyncio
 from unittest.mock import patch, MagicMock
 
 import httpx
+import orjson
 import pytest
 
-from app.services.tmdb import TMDBService
+from app.services.tmdb import TMDBService, _MEMO, _get_shared_client, close_shared_client
 from app.models.enums import Languages
 
 
 class TestTMDBService:
     """Tests for the TMDBService class."""
 
+    @pytest.fixture(autouse=True)
+    async def clear_memo(self):
+        """Fixture clearing memoized TMDB lookups between tests."""
+        await _MEMO.clear()
+        yield
+        await _MEMO.clear()
+
     @pytest.fixture
     def tmdb_service(self):
         """Fixture providing a TMDBService instance."""
@@ -27,15 +36,25 @@ class TestTMDBService:
         assert service.base_url == "https://api.themoviedb.org/3"
         assert service.language == "en-US"
 
+    async def test_shared_client_reused(self):
+        """Test that the shared HTTP client is reused until closed."""
+        client = _get_shared_client()
+        assert _get_shared_client() is client
+
+        await close_shared_client()
+        assert client.is_closed
+        assert _get_shared_client() is not client
+        await close_shared_client()
+
     @patch("httpx.AsyncClient.get")
     async def test_search_movie_success(self, mock_get, tmdb_service):
         """Test successful movie search."""
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [{"id": 550, "title": "Fight Club", "release_date": "1999-10-15"}]
-        }
+        mock_response.content = orjson.dumps(
+            {"results": [{"id": 550, "title": "Fight Club", "release_date": "1999-10-15"}]}
+        )
         mock_get.return_value = mock_response
 
         # Call the method
@@ -58,9 +77,9 @@ class TestTMDBService:
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [{"id": 550, "title": "Fight Club", "release_date": "1999-10-15"}]
-        }
+        mock_response.content = orjson.dumps(
+            {"results": [{"id": 550, "title": "Fight Club", "release_date": "1999-10-15"}]}
+        )
         mock_get.return_value = mock_response
 
         # Call the method
@@ -77,7 +96,7 @@ class TestTMDBService:
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}
+        mock_response.content = orjson.dumps({"results": []})
         mock_get.return_value = mock_response
 
         # Call the method
@@ -115,19 +134,142 @@ class TestTMDBService:
         # Verify the result
         assert results == []
 
+    @patch("httpx.AsyncClient.get")
+    async def test_search_movie_fuzzy_matching(self, mock_get, tmdb_service):
+        """Test that close titles are kept, ranked by score, and unrelated results dropped."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {
+                "results": [
+                    {"id": 1, "title": "The Matrix Reloaded", "release_date": "2003-05-15"},
+                    {"id": 2, "title": "Completely Different", "release_date": "2001-01-01"},
+                    {"id": 603, "title": "The Matrix", "release_date": "1999-03-31"},
+                ]
+            }
+        )
+        mock_get.return_value = mock_response
+
+        results = await tmdb_service.search_movie("the matrix")
+
+        assert [r["id"] for r in results] == [603, 1]
+        assert all("_score" not in r for r in results)
+
+    @pytest.mark.parametrize(
+        "query,candidate",
+        [
+            ("Lost", "Lost in Translation"),
+            ("Friends", "Friends with Benefits"),
+            ("Up", "Upgrade"),
+            ("Batman", "Batman Begins"),
+            ("House", "House of Cards"),
+            ("Dune", "Dune: Part Two"),
+            ("Star Wars", "Star Trek"),
+        ],
+    )
+    @patch("httpx.AsyncClient.get")
+    async def test_search_movie_drops_prefix_titles(self, mock_get, tmdb_service, query, candidate):
+        """Test that titles merely starting with the query are not kept as relaxed matches."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({"results": [{"id": 1, "title": query}, {"id": 2, "title": candidate}]})
+        mock_get.return_value = mock_response
+
+        results = await tmdb_service.search_movie(query)
+
+        assert [r["id"] for r in results] == [1]
+
+    @pytest.mark.parametrize(
+        "query,candidate",
+        [
+            ("Spiderman", "Spider-Man"),
+            ("Amelie", "Amélie"),
+            ("Se7en", "Seven"),
+            ("Pans Labyrinth", "Pan's Labyrinth"),
+            ("Mission Impossible", "Mission: Impossible"),
+            ("The Office US", "The Office"),
+        ],
+    )
+    @patch("httpx.AsyncClient.get")
+    async def test_search_movie_keeps_title_variants(self, mock_get, tmdb_service, query, candidate):
+        """Test that spelling and punctuation variants are kept even when not the top result."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {"results": [{"id": 1, "title": "Completely Different"}, {"id": 2, "title": candidate}]}
+        )
+        mock_get.return_value = mock_response
+
+        results = await tmdb_service.search_movie(query)
+
+        assert [r["id"] for r in results] == [2]
+
+    @patch("httpx.AsyncClient.get")
+    async def test_search_movie_exact_match_with_year(self, mock_get, tmdb_service):
+        """Test that an exact title and year match on the first result is returned on its own."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {
+                "results": [
+                    {"id": 438631, "title": "Dune", "release_date": "2021-09-15"},
+                    {"id": 841, "title": "Dune", "release_date": "1984-12-14"},
+                ]
+            }
+        )
+        mock_get.return_value = mock_response
+
+        assert [r["id"] for r in await tmdb_service.search_movie("Dune", 2021)] == [438631]
+        assert [r["id"] for r in await tmdb_service.search_movie("Dune")] == [438631, 841]
+
+    @patch("httpx.AsyncClient.get")
+    async def test_search_movie_memoized(self, mock_get, tmdb_service):
+        """Test that concurrent and repeated searches for the same title issue a single request."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {"results": [{"id": 550, "title": "Fight Club", "release_date": "1999-10-15"}]}
+        )
+        mock_get.return_value = mock_response
+
+        results = await asyncio.gather(*(tmdb_service.search_movie("Fight Club", 1999) for _ in range(10)))
+        results.append(await tmdb_service.search_movie("Fight Club", 1999))
+
+        assert all(r[0]["id"] == 550 for r in results)
+        search_calls = [c for c in mock_get.call_args_list if c.args[0].endswith("/search/movie")]
+        assert len(search_calls) == 1
+
+    @patch("httpx.AsyncClient.get")
+    async def test_search_movie_does_not_fetch_details(self, mock_get, tmdb_service):
+        """Test that a search only issues the search request, leaving details to the caller."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(
+            {"results": [{"id": 550, "title": "Fight Club", "release_date": "1999-10-15"}]}
+        )
+        mock_get.return_value = mock_response
+
+        await tmdb_service.search_movie("Fight Club")
+        await asyncio.sleep(0)
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[0] == "https://api.themoviedb.org/3/search/movie"
+
     @patch("httpx.AsyncClient.get")
     async def test_get_movie_details_success(self, mock_get, tmdb_service):
         """Test successful movie details retrieval."""
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": 550,
-            "title": "Fight Club",
-            "overview": "A ticking-time-bomb insomniac and a slippery soap salesman channel primal male aggression into a shocking new form of therapy.",
-            "release_date": "1999-10-15",
-            "external_ids": {"imdb_id": "tt0137523"},
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "id": 550,
+                "title": "Fight Club",
+                "overview": "A ticking-time-bomb insomniac and a slippery soap salesman channel primal male aggression into a shocking new form of therapy.",
+                "release_date": "1999-10-15",
+                "external_ids": {"imdb_id": "tt0137523"},
+            }
+        )
         mock_get.return_value = mock_response
 
         # Call the method
@@ -145,9 +287,9 @@ class TestTMDBService:
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [{"id": 1399, "name": "Game of Thrones", "first_air_date": "2011-04-17"}]
-        }
+        mock_response.content = orjson.dumps(
+            {"results": [{"id": 1399, "name": "Game of Thrones", "first_air_date": "2011-04-17"}]}
+        )
         mock_get.return_value = mock_response
 
         # Call the method
@@ -170,9 +312,9 @@ class TestTMDBService:
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [{"id": 1399, "name": "Game of Thrones", "first_air_date": "2011-04-17"}]
-        }
+        mock_response.content = orjson.dumps(
+            {"results": [{"id": 1399, "name": "Game of Thrones", "first_air_date": "2011-04-17"}]}
+        )
         mock_get.return_value = mock_response
 
         # Call the method
@@ -189,7 +331,7 @@ class TestTMDBService:
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}
+        mock_response.content = orjson.dumps({"results": []})
         mock_get.return_value = mock_response
 
         # Call the method
@@ -204,14 +346,16 @@ class TestTMDBService:
         # Mock the response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": 1399,
-            "name": "Game of Thrones",
-            "overview": "Seven noble families fight for control of the mythical land of Westeros.",
-            "first_air_date": "2011-04-17",
-            "episode_run_time": [60],
-            "external_ids": {"imdb_id": "tt0944947"},
-        }
+        mock_response.content = orjson.dumps(
+            {
+                "id": 1399,
+                "name": "Game of Thrones",
+                "overview": "Seven noble families fight for control of the mythical land of Westeros.",
+                "first_air_date": "2011-04-17",
+                "episode_run_time": [60],
+                "external_ids": {"imdb_id": "tt0944947"},
+            }
+        )
         mock_get.return_value = mock_response
 
         # Call the method
@@ -228,6 +372,21 @@ class TestTMDBService:
         assert args[0] == "https://api.themoviedb.org/3/tv/1399"
         assert kwargs["params"]["append_to_response"] == "external_ids"
 
+    @patch("httpx.AsyncClient.get")
+    async def test_get_movie_details_append(self, mock_get, tmdb_service):
+        """Test that extra sub-resources are requested in a single call."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({"id": 550, "title": "Fight Club", "credits": {"cast": []}})
+        mock_get.return_value = mock_response
+
+        result = await tmdb_service.get_movie_details(550, append=("external_ids", "credits", "videos"))
+
+        assert result["credits"] == {"cast": []}
+        mock_get.assert_called_once()
+        args, kwargs = mock_get.call_args
+        assert kwargs["params"]["append_to_response"] == "external_ids,credits,videos"
+
     @patch("httpx.AsyncClient.get")
     async def test_get_movie_details_http_error(self, mock_get, tmdb_service):
         """Test movie details retrieval with HTTP error."""